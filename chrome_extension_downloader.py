@@ -12,25 +12,67 @@ import argparse
 import requests
 import sys
 import os
-import re
 import urllib3
 import logging
+import logging.handlers
 import json
 import time
 import zipfile
 import shutil
+import tempfile
+import threading
+import mmap
+import struct
+import zlib
+import socket
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from crx_utils import ChromeWebStoreURLBuilder
+from types import SimpleNamespace
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, Iterable, Iterator
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from crx_utils import ChromeWebStoreURLBuilder, SIZE_UNITS, CWS_UPDATE_HOST, is_valid_extension_id
+from crx_cache import CrxCache
 
-# Configure logging
+try:
+    import deflate  # Optional libdeflate bindings for faster whole-member inflation
+except ImportError:
+    deflate = None
+if deflate is not None and not hasattr(deflate, 'deflate_decompress'):
+    deflate = None  # Releases before 0.5.0 only have the gzip functions
+
+try:
+    import orjson  # Optional C JSON codec for faster config load/save
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes with orjson when available, falling back to the json module"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to indented JSON bytes with orjson when available, falling back to the json module"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+# Configure logging. File records are buffered and written 100 at a time (or straight
+# away for warnings and errors) rather than one write per record; the buffer is
+# flushed at interpreter exit
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+_log_file_handler = logging.FileHandler('chrome_extension_downloader.log', encoding='utf-8')
+_log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler('chrome_extension_downloader.log', encoding='utf-8')
+        logging.handlers.MemoryHandler(capacity=100, flushLevel=logging.WARNING, target=_log_file_handler)
     ]
 )
 logger = logging.getLogger(__name__)
@@ -38,6 +80,50 @@ logger = logging.getLogger(__name__)
 # Disable SSL warnings by default since verify_ssl is False by default
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Minimum time between redraws of the download progress line (10 Hz)
+PROGRESS_INTERVAL_SECONDS = 0.1
+
+# Archives with fewer files than this are extracted on the calling thread
+PARALLEL_EXTRACT_MIN_FILES = 8
+
+# Extracted files smaller than this are written without preallocating them first
+PREALLOCATE_MIN_BYTES = 1 << 20
+
+# Batch downloads keep at most this many queued downloads per worker thread
+BATCH_IN_FLIGHT_PER_WORKER = 4
+
+# Every download goes to the same host, so more workers than this only queue on its connections
+MAX_BATCH_WORKERS = 16
+
+# Hosts already resolved by _warm_dns in this process
+_warmed_hosts = set()
+
+
+def _warm_dns(host: str, port: int = 443):
+    """
+    Resolve host once per process before a batch starts
+    
+    Lets the OS resolver cache the answer, so batch workers connecting at the same
+    time don't each pay for a cold lookup. Failures are left for the download itself
+    to report.
+    """
+    if host in _warmed_hosts:
+        return
+    _warmed_hosts.add(host)
+    try:
+        socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except OSError as e:
+        logger.debug(f"DNS pre-resolution of {host} failed: {e}")
+
+
+class DownloadBlockedError(ValueError):
+    """The server refused the download outright (HTTP 403/429); further requests in a batch will fail too"""
+
+
+class IncompleteDownloadError(ValueError):
+    """The response body ended early: the connection dropped or fell short of its Content-Length"""
+
+
 class Config:
     """Configuration management for the extension downloader"""
     
@@ -47,6 +133,7 @@ class Config:
             "download": {
                 "max_file_size_mb": 100,
                 "timeout_seconds": 30,
+                "connect_timeout_seconds": 5,
                 "retry_attempts": 3,
                 "retry_delay_seconds": 2,
                 "verify_ssl": False,
@@ -61,9 +148,12 @@ class Config:
             },
             "performance": {
                 "max_concurrent_downloads": 3,
-                "chunk_size": 8192,
+                "chunk_size": 65536,
                 "enable_caching": True,
-                "cache_directory": "./cache"
+                "cache_directory": "./cache",
+                "cache_expire_seconds": 86400,
+                "cache_max_entries": 100,
+                "cache_max_size_mb": 500
             },
             "security": {
                 "validate_extension_id": True,
@@ -77,8 +167,7 @@ class Config:
         """Load configuration from file or create default"""
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
+                config = _json_loads(Path(self.config_file).read_bytes())
                 # Merge with defaults for any missing keys
                 return self._merge_configs(self.default_config, config)
             except Exception as e:
@@ -86,79 +175,157 @@ class Config:
         return self.default_config.copy()
     
     def _merge_configs(self, default: Dict, user: Dict) -> Dict:
-        """Recursively merge user config with defaults"""
+        """Merge user config with defaults, walking nested sections with an explicit stack"""
         result = default.copy()
-        for key, value in user.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_configs(result[key], value)
-            else:
-                result[key] = value
+        stack = [(result, user)]
+        while stack:
+            target, overrides = stack.pop()
+            for key, value in overrides.items():
+                current = target.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    merged = current.copy()
+                    target[key] = merged
+                    stack.append((merged, value))
+                else:
+                    target[key] = value
         return result
     
     def save_config(self):
         """Save current configuration to file"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            # Write to a temporary file and swap it in so readers never see a torn file
+            config_path = Path(self.config_file)
+            tmp_path = config_path.with_name(f".{config_path.name}.{os.getpid()}.tmp")
+            try:
+                tmp_path.write_bytes(_json_dumps(self.config))
+                os.replace(tmp_path, config_path)
+            except Exception:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+                raise
             logger.info(f"Configuration saved to {self.config_file}")
         except Exception as e:
             logger.error(f"Failed to save config: {e}")
 
 class AutoExtensionDownloader:
+    # Deletes every ASCII character that is not alphanumeric, space, '-' or '_'
+    _SANITIZE_TABLE = str.maketrans('', '', ''.join(
+        chr(c) for c in range(128) if not (chr(c).isalnum() or chr(c) in ' -_')
+    ))
+    # Characters Windows forbids in file names, replaced the way zipfile does
+    _WINDOWS_NAME_TABLE = str.maketrans(':<>"|?*', '_' * 7)
+    
     def __init__(self, config: Optional[Config] = None):
         self.config = config or Config()
+        self.cfg = self._resolve_settings()
         self.url_builder = ChromeWebStoreURLBuilder()
         self.session = requests.Session()
         self._setup_session()
-        self.download_cache = {}
+        # Set to make in-flight downloads stop at their next chunk (see cancel())
+        self._cancelled = threading.Event()
+        self.crx_cache = None
+        if self.config.config["performance"]["enable_caching"]:
+            performance = self.config.config["performance"]
+            self.crx_cache = CrxCache(
+                performance["cache_directory"],
+                performance["cache_expire_seconds"],
+                performance["cache_max_entries"],
+                performance["cache_max_size_mb"] * 1024 * 1024
+            )
         
+    def _resolve_settings(self) -> SimpleNamespace:
+        """Snapshot the settings read on every download so hot paths use attribute access"""
+        download = self.config.config["download"]
+        performance = self.config.config["performance"]
+        security = self.config.config["security"]
+        return SimpleNamespace(
+            user_agent=download["user_agent"],
+            verify_ssl=download["verify_ssl"],
+            # (connect, read) so an unreachable host fails fast while slow transfers get the full budget
+            timeout=(download["connect_timeout_seconds"], download["timeout_seconds"]),
+            max_retries=download["retry_attempts"],
+            retry_delay=download["retry_delay_seconds"],
+            max_file_size=int(download["max_file_size_mb"] * 1024 * 1024),
+            chunk_size=performance["chunk_size"],
+            validate_ids=security["validate_extension_id"],
+            check_integrity=security["check_file_integrity"],
+        )
+    
     def _setup_session(self):
         """Setup HTTP session with proper configuration"""
         self.session.headers.update({
-            "User-Agent": self.config.config["download"]["user_agent"],
+            "User-Agent": self.cfg.user_agent,
             "Referer": "https://chrome.google.com",
             "Accept": "application/octet-stream,application/x-chrome-extension,*/*",
             "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
+            # CRX files are ZIP archives already; asking for compression only adds a zlib pass
+            "Accept-Encoding": "identity",
             "DNT": "1",
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1",
         })
         
         # Configure SSL verification - always disabled for compatibility
-        verify_ssl = self.config.config["download"]["verify_ssl"]
-        self.session.verify = verify_ssl
+        self.session.verify = self.cfg.verify_ssl
         logger.info("SSL verification disabled - requests will bypass SSL certificate validation")
+        
+        self._mount_adapter(self.config.config["performance"]["max_concurrent_downloads"])
+    
+    def close(self):
+        """Release the pooled HTTP connections held by the session"""
+        self.session.close()
+    
+    def cancel(self):
+        """Make running downloads abort at their next chunk; their partial files are removed"""
+        self._cancelled.set()
+    
+    def _mount_adapter(self, pool_size: int):
+        """
+        Mount an adapter whose keep-alive pool lets every worker thread reuse a connection
+        
+        The adapter also owns retries: max_retries is the total number of attempts, and
+        the delay between them grows exponentially from retry_delay. The pool blocks
+        rather than overflowing, so a burst never opens (and then discards) connections
+        beyond pool_size, each of which would cost a fresh TLS handshake.
+        """
+        retries = Retry(
+            total=max(self.cfg.max_retries - 1, 0),
+            backoff_factor=self.cfg.retry_delay,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_maxsize=max(pool_size, 1), pool_block=True, max_retries=retries)
+        self._retries = retries
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._pool_size = pool_size
+    
+    def _safe_name(self, name: str, fallback: str) -> str:
+        """Reduce a name to alphanumerics, '-' and '_' for use in file and directory names"""
+        if name.isascii():
+            safe_name = name.translate(self._SANITIZE_TABLE).rstrip()
+        else:
+            # Non-ASCII letters and digits are kept, which the ASCII table can't express
+            safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        return safe_name.replace(' ', '_') if safe_name else fallback
     
     def validate_extension_id(self, extension_id: str) -> bool:
         """Validate Chrome extension ID format"""
-        if not isinstance(extension_id, str):
-            return False
-        return bool(re.match(r'^[a-p]{32}$', extension_id))
+        return is_valid_extension_id(extension_id)
     
     def get_extension_metadata(self, extension_id: str) -> Dict[str, Any]:
         """Get extension metadata from Chrome Web Store"""
-        try:
-            # Try to get metadata from Chrome Web Store API
-            metadata_url = f"https://chrome.google.com/webstore/detail/dummy/{extension_id}"
-            response = self.session.get(metadata_url, timeout=self.config.config["download"]["timeout_seconds"])
-            
-            # This is a simplified approach - in reality, you'd need to parse the HTML
-            # or use a proper Chrome Web Store API if available
-            return {
-                "id": extension_id,
-                "name": f"Extension {extension_id}",
-                "version": "Unknown",
-                "description": "Metadata extraction not fully implemented"
-            }
-        except Exception as e:
-            logger.warning(f"Failed to get metadata for {extension_id}: {e}")
-            return {
-                "id": extension_id,
-                "name": f"Extension {extension_id}",
-                "version": "Unknown",
-                "description": "Metadata unavailable"
-            }
+        # Placeholder metadata. The Web Store detail page would have to be fetched and its
+        # HTML parsed to get real values; until then no request is made, so every download
+        # costs a single round trip.
+        return {
+            "id": extension_id,
+            "name": f"Extension {extension_id}",
+            "version": "Unknown",
+            "description": "Metadata extraction not fully implemented"
+        }
     
     def download_and_convert(self, extension_id: str, output_filename: Optional[str] = None, 
                            cleanup: bool = True, show_progress: bool = True) -> str:
@@ -178,98 +345,173 @@ class AutoExtensionDownloader:
             ValueError: If extension ID is invalid or download fails
             FileNotFoundError: If output directory doesn't exist
         """
-        # Validate extension ID
-        if self.config.config["security"]["validate_extension_id"]:
+        # A cancel() aimed at an earlier download must not abort this one
+        self._cancelled.clear()
+        
+        # Validate extension ID (download_multiple checks IDs before submitting them)
+        if self.cfg.validate_ids:
             if not self.validate_extension_id(extension_id):
                 raise ValueError(f"Invalid extension ID format: {extension_id}. Must be 32 characters (a-p only)")
         
+        job = self._fetch_crx(extension_id, output_filename, show_progress)
+        return self._convert_crx(job, cleanup)
+    
+    def _fetch_crx(self, extension_id: str, output_filename: Optional[str] = None,
+                   show_progress: bool = True, work_dir: Optional[Path] = None) -> SimpleNamespace:
+        """
+        Download stage of download_and_convert: put the extension's CRX on disk
+        
+        Args:
+            work_dir (Path): Directory on the output filesystem for intermediate files;
+                when given, the CRX and ZIP are only moved to the output directory once
+                they are complete (optional)
+        
+        Returns:
+            SimpleNamespace: The extension ID, its metadata, the CRX path, the ZIP
+            path to convert it to and the work directory, for _convert_crx
+        """
         # Get extension metadata
         metadata = self.get_extension_metadata(extension_id)
         logger.info(f"Downloading extension: {metadata['name']} ({extension_id})")
         
+        # Setup output directory
+        output_dir = Path(self.config.config["output"]["default_directory"])
+        crx_filename = (work_dir or output_dir) / f"{extension_id}.crx"
+        
         try:
             # Generate download URL
             download_url = self.url_builder.to_cws_url(extension_id)
             logger.debug(f"Download URL: {download_url}")
             
-            # Setup output directory
-            output_dir = Path(self.config.config["output"]["default_directory"])
             output_dir.mkdir(parents=True, exist_ok=True)
             
             # Generate filenames
             if not output_filename:
-                safe_name = "".join(c for c in metadata['name'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                safe_name = safe_name.replace(' ', '_') if safe_name else extension_id
-                output_filename = f"{safe_name}_{extension_id}.zip"
+                output_filename = f"{self._safe_name(metadata['name'], extension_id)}_{extension_id}.zip"
             
             # Ensure output filename has .zip extension
             if not output_filename.endswith('.zip'):
                 output_filename += '.zip'
             
             output_path = output_dir / output_filename
-            crx_filename = output_dir / f"{extension_id}.crx"
             
-            # Check cache first
-            if self.config.config["performance"]["enable_caching"]:
-                cache_key = f"{extension_id}_{hash(download_url)}"
-                if cache_key in self.download_cache:
+            # Check cache first: fresh entries skip the network, stale ones are revalidated
+            crx_size = None
+            if self.crx_cache:
+                cache_entry = self.crx_cache.lookup(extension_id, download_url)
+                if cache_entry and self.crx_cache.is_fresh(cache_entry):
                     logger.info("Using cached download")
-                    crx_data = self.download_cache[cache_key]
-                else:
-                    crx_data = self._download_crx(download_url, show_progress)
-                    if crx_data:
-                        self.download_cache[cache_key] = crx_data
+                    crx_size = self._restore_cached(extension_id, crx_filename)
+                    if crx_size is None:
+                        cache_entry = None
+                if crx_size is None:
+                    download = self._download_crx(download_url, crx_filename, show_progress,
+                                                  headers=self.crx_cache.conditional_headers(cache_entry))
+                    if download and download["not_modified"]:
+                        logger.info("Extension not modified since last download - using cached download")
+                        self.crx_cache.touch(extension_id)
+                        crx_size = self._restore_cached(extension_id, crx_filename)
+                        if crx_size is None:
+                            download = self._download_crx(download_url, crx_filename, show_progress)
+                    if download and not download["not_modified"]:
+                        crx_size = download["size"]
+                        self.crx_cache.store(extension_id, download_url, crx_filename,
+                                             download["etag"], download["last_modified"])
             else:
-                crx_data = self._download_crx(download_url, show_progress)
+                download = self._download_crx(download_url, crx_filename, show_progress)
+                if download:
+                    crx_size = download["size"]
             
-            if not crx_data:
+            if not crx_size:
                 raise ValueError("Failed to download CRX file")
             
             # Validate file size
-            max_size = self.config.config["download"]["max_file_size_mb"] * 1024 * 1024
-            if len(crx_data) > max_size:
-                raise ValueError(f"File too large: {self._format_size(len(crx_data))} > {self._format_size(max_size)}")
-            
-            # Save CRX file temporarily
-            with open(crx_filename, 'wb') as f:
-                f.write(crx_data)
+            max_size = self.cfg.max_file_size
+            if crx_size > max_size:
+                raise ValueError(f"File too large: {self._format_size(crx_size)} > {self._format_size(max_size)}")
             
-            logger.info(f"CRX file saved: {crx_filename} ({self._format_size(len(crx_data))})")
+            logger.info(f"CRX file saved: {crx_filename} ({self._format_size(crx_size)})")
+            return SimpleNamespace(extension_id=extension_id, metadata=metadata,
+                                   crx_path=crx_filename, output_path=output_path,
+                                   work_dir=work_dir)
             
-            # Convert to ZIP
-            logger.info(f"Converting to ZIP: {output_path}")
-            zip_file = self.url_builder.crx_to_zip(crx_data, str(output_path))
-            
-            # Validate ZIP file integrity
-            if self.config.config["security"]["check_file_integrity"]:
-                self._validate_zip_integrity(zip_file)
+        except (Exception, KeyboardInterrupt) as e:
+            self._fail_download(extension_id, crx_filename, e)
+            raise e
+    
+    def _restore_cached(self, extension_id: str, crx_path: Path) -> Optional[int]:
+        """Restore a cached CRX, or return None if another worker's store() evicted it after lookup"""
+        try:
+            return self.crx_cache.restore(extension_id, crx_path)
+        except FileNotFoundError:
+            logger.info("Cached download was evicted - downloading it again")
+            return None
+    
+    def _convert_crx(self, job: SimpleNamespace, cleanup: bool = True,
+                     extract_workers: Optional[int] = None) -> str:
+        """
+        Conversion stage of download_and_convert: turn a fetched CRX into a ZIP,
+        extract or verify it, and optionally delete the CRX
+        
+        extract_workers caps the threads each extraction uses (default: CPU count),
+        for callers that already run several conversions at once.
+        
+        Returns:
+            str: Path to the final ZIP file
+        """
+        extension_id = job.extension_id
+        crx_filename = job.crx_path
+        # With a work directory the ZIP is built there and only renamed into place once
+        # it has been extracted or verified, so an interrupted batch leaves no partial ZIP
+        zip_target = job.work_dir / job.output_path.name if job.work_dir else job.output_path
+        try:
+            # Convert to ZIP file-to-file, without reading the CRX into memory
+            logger.info(f"Converting to ZIP: {job.output_path}")
+            zip_file = self.url_builder.crx_to_zip_path(crx_filename, zip_target)
             
-            # Extract ZIP file if auto_extract is enabled
+            # Extract ZIP file if auto_extract is enabled. Extraction inflates and CRC-checks
+            # every member, so it doubles as the integrity check; the separate testzip()
+            # pass only runs when nothing is extracted
             extracted_path = None
             if self.config.config["output"]["auto_extract"]:
-                extracted_path = self._extract_zip(zip_file, extension_id, metadata)
+                extracted_path = self._extract_zip(zip_file, extension_id, job.metadata, extract_workers)
                 logger.info(f"Extension extracted to: {extracted_path}")
+            elif self.cfg.check_integrity:
+                self._validate_zip_integrity(zip_file)
+            
+            if job.work_dir:
+                os.replace(zip_target, job.output_path)
+                zip_file = str(job.output_path)
             
             # Clean up CRX file if requested
             if cleanup and self.config.config["output"]["auto_cleanup"]:
                 logger.info(f"Cleaning up CRX file: {crx_filename}")
                 os.remove(crx_filename)
                 logger.info("CRX file deleted")
+            elif job.work_dir:
+                # Kept CRX files belong next to the ZIP, not in the batch work directory
+                os.replace(crx_filename, job.output_path.parent / crx_filename.name)
             
             logger.info(f"Success! Extension downloaded and converted to: {zip_file}")
             if extracted_path:
                 logger.info(f"Extension extracted to: {extracted_path}")
             return zip_file
             
-        except Exception as e:
-            # Clean up CRX file on error if it exists
-            crx_filename = output_dir / f"{extension_id}.crx"
-            if crx_filename.exists():
-                logger.info(f"Cleaning up CRX file after error: {crx_filename}")
-                os.remove(crx_filename)
-            logger.error(f"Download failed for {extension_id}: {e}")
+        except (Exception, KeyboardInterrupt) as e:
+            if self.crx_cache and isinstance(e, Exception):
+                # The cached CRX is this same file; drop it so the next attempt downloads
+                # afresh instead of revalidating (304) and restoring a broken copy
+                self.crx_cache.discard(extension_id)
+            self._fail_download(extension_id, crx_filename, e)
             raise e
     
+    def _fail_download(self, extension_id: str, crx_filename: Path, error: Exception):
+        """Clean up the CRX file left behind by a failed download or conversion and log the failure"""
+        if crx_filename.exists():
+            logger.info(f"Cleaning up CRX file after error: {crx_filename}")
+            os.remove(crx_filename)
+        logger.error(f"Download failed for {extension_id}: {error}")
+    
     def _validate_zip_integrity(self, zip_file: str):
         """Validate ZIP file integrity"""
         try:
@@ -283,7 +525,8 @@ class AutoExtensionDownloader:
             logger.error(f"ZIP integrity validation failed: {e}")
             raise
     
-    def _extract_zip(self, zip_file: str, extension_id: str, metadata: Dict[str, Any]) -> str:
+    def _extract_zip(self, zip_file: str, extension_id: str, metadata: Dict[str, Any],
+                     max_workers: Optional[int] = None) -> str:
         """
         Extract ZIP file to the configured extraction directory
         
@@ -291,6 +534,7 @@ class AutoExtensionDownloader:
             zip_file (str): Path to the ZIP file
             extension_id (str): Chrome extension ID
             metadata (Dict[str, Any]): Extension metadata
+            max_workers (int): Maximum extraction threads, defaulting to the CPU count (optional)
             
         Returns:
             str: Path to the extracted directory
@@ -300,25 +544,34 @@ class AutoExtensionDownloader:
             extract_dir.mkdir(parents=True, exist_ok=True)
             
             # Create a safe directory name from extension name and ID
-            safe_name = "".join(c for c in metadata.get('name', extension_id) if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            safe_name = safe_name.replace(' ', '_') if safe_name else extension_id
-            extension_folder_name = f"{safe_name}_{extension_id}"
+            extension_folder_name = f"{self._safe_name(metadata.get('name', extension_id), extension_id)}_{extension_id}"
             
             # Create the extension-specific directory
             extension_dir = extract_dir / extension_folder_name
             
+            # Extract into a staging directory first so a corrupt archive (caught by the
+            # per-member CRC checks) never replaces a previous good extraction
+            staging_dir = extract_dir / f".{extension_folder_name}.partial"
+            if staging_dir.exists():
+                shutil.rmtree(staging_dir)
+            
+            logger.info(f"Extracting ZIP to: {extension_dir}")
+            try:
+                with open(zip_file, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as zip_view, \
+                        zipfile.ZipFile(f, 'r') as zf:
+                    file_count = self._write_members(zf, zip_view, staging_dir, max_workers)
+            except Exception:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                raise
+            
             # Remove existing directory if it exists
             if extension_dir.exists():
                 logger.info(f"Removing existing directory: {extension_dir}")
                 shutil.rmtree(extension_dir)
+            staging_dir.mkdir(exist_ok=True)
+            os.replace(staging_dir, extension_dir)
             
-            # Extract the ZIP file
-            logger.info(f"Extracting ZIP to: {extension_dir}")
-            with zipfile.ZipFile(zip_file, 'r') as zf:
-                zf.extractall(extension_dir)
-            
-            # Count extracted files
-            file_count = sum(1 for _ in extension_dir.rglob('*') if _.is_file())
             logger.info(f"Extracted {file_count} files to {extension_dir}")
             
             return str(extension_dir)
@@ -327,102 +580,315 @@ class AutoExtensionDownloader:
             logger.error(f"Failed to extract ZIP file: {e}")
             raise ValueError(f"Failed to extract extension: {e}")
     
-    def _download_crx(self, download_url: str, show_progress: bool = True) -> Optional[bytes]:
-        """Download CRX file from URL with retry logic and progress indication"""
-        max_retries = self.config.config["download"]["retry_attempts"]
-        retry_delay = self.config.config["download"]["retry_delay_seconds"]
-        timeout = self.config.config["download"]["timeout_seconds"]
-        chunk_size = self.config.config["performance"]["chunk_size"]
+    def _write_members(self, zf: zipfile.ZipFile, zip_view: mmap.mmap, extension_dir: Path,
+                       max_workers: Optional[int] = None) -> int:
+        """
+        Write every ZIP member to disk with a single write call per file
+        
+        Directories are created up front, once each. Files are then inflated whole
+        from the mapped archive and written unbuffered, spread across a pool of up
+        to max_workers threads (default: CPU count) since zlib/libdeflate, crc32 and
+        file writes all release the GIL.
+        
+        Returns:
+            int: Number of files written, taken from the archive's member list
+        """
+        created_dirs = set()
+        jobs = []
+        extension_dir = extension_dir.resolve()
+        for member in zf.infolist():
+            target = self._member_path(extension_dir, member.filename)
+            if target == extension_dir:
+                continue
+            directory = target if member.is_dir() else target.parent
+            if directory not in created_dirs:
+                directory.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(directory)
+            if not member.is_dir():
+                jobs.append((member, target))
+        
+        def write_member(job):
+            member, target = job
+            self._write_file(target, self._read_member(zf, zip_view, member))
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        if workers <= 1 or len(jobs) < PARALLEL_EXTRACT_MIN_FILES:
+            for job in jobs:
+                write_member(job)
+            return len(jobs)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Consuming the iterator re-raises the first member that failed
+            for _ in executor.map(write_member, jobs):
+                pass
+        return len(jobs)
+    
+    @staticmethod
+    def _write_file(target: Path, data: bytes):
+        """
+        Create target and write data to it with as few syscalls as possible
+        
+        The final size is known up front, so files of PREALLOCATE_MIN_BYTES or more
+        have their blocks reserved in one posix_fallocate call (where supported)
+        before the data is written. Smaller files skip it: for them it is just an
+        extra syscall, and glibc emulates it with a write per block on filesystems
+        without fallocate(2).
+        """
+        fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+        try:
+            if len(data) >= PREALLOCATE_MIN_BYTES and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(fd, 0, len(data))
+                except OSError:
+                    pass  # Filesystem doesn't support preallocation
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+    
+    @staticmethod
+    def _read_member(zf: zipfile.ZipFile, zip_view: mmap.mmap, member: zipfile.ZipInfo) -> bytes:
+        """
+        Read and CRC-check one ZIP member directly from the mapped archive
+        
+        STORED members are sliced out as-is and DEFLATED members are inflated in one
+        call (libdeflate when installed, zlib otherwise). Encrypted members and other
+        compression methods go through zipfile.
+        """
+        if member.flag_bits & 0x1 or member.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            return zf.read(member)
+        
+        # Local file header: signature(4) ... name length(2) + extra length(2) at offset 26
+        offset = member.header_offset
+        if zip_view[offset:offset + 4] != b'PK\x03\x04':
+            raise zipfile.BadZipFile(f"Bad local file header for {member.filename}")
+        name_length, extra_length = struct.unpack('<HH', zip_view[offset + 26:offset + 30])
+        data_start = offset + 30 + name_length + extra_length
+        raw = zip_view[data_start:data_start + member.compress_size]
+        
+        if member.compress_type == zipfile.ZIP_STORED or member.file_size == 0:
+            data = raw if member.file_size else b''
+        elif deflate is not None:
+            data = deflate.deflate_decompress(raw, member.file_size)
+        else:
+            data = zlib.decompress(raw, -zlib.MAX_WBITS, member.file_size)
+        
+        if len(data) != member.file_size or zlib.crc32(data) != member.CRC:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for file {member.filename}")
+        return data
+    
+    @classmethod
+    def _member_path(cls, extension_dir: Path, filename: str) -> Path:
+        """
+        Map a ZIP member name to a path inside extension_dir (which must be resolved)
+        
+        Applies zipfile's own cleanup: absolute, '.' and '..' components are dropped
+        and, on Windows, illegal characters and trailing dots are replaced. Any name
+        that still resolves outside extension_dir is rejected with BadZipFile.
+        """
+        arcname = filename.replace('/', os.path.sep)
+        if os.path.altsep:
+            arcname = arcname.replace(os.path.altsep, os.path.sep)
+        arcname = os.path.splitdrive(arcname)[1]
+        parts = [part for part in arcname.split(os.path.sep) if part not in ('', os.path.curdir, os.path.pardir)]
+        if os.path.sep == '\\':
+            parts = [part.translate(cls._WINDOWS_NAME_TABLE).rstrip('.') for part in parts]
+            parts = [part for part in parts if part]
+        target = extension_dir.joinpath(*parts)
+        resolved = target.resolve()
+        if resolved != extension_dir and extension_dir not in resolved.parents:
+            raise zipfile.BadZipFile(f"Unsafe path for file {filename}")
+        return target
+    
+    def _download_crx(self, download_url: str, crx_path: Path, show_progress: bool = True,
+                      headers: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Stream CRX file from URL to disk with progress indication
         
-        for attempt in range(max_retries):
+        Failed connections and 429/5xx responses are retried by the session's adapter
+        (see _mount_adapter), with exponential backoff and Retry-After support. The adapter
+        can't see a connection that drops once the body is streaming, so those downloads
+        are restarted here, drawing on the same Retry policy for the attempt budget and
+        backoff.
+        
+        Args:
+            download_url (str): CRX download URL
+            crx_path (Path): Destination path for the CRX file
+            show_progress (bool): Whether to show download progress
+            headers (Dict[str, str]): Extra request headers, e.g. cache validators (optional)
+        
+        Returns:
+            Optional[Dict[str, Any]]: Bytes written, whether the server answered 304 Not Modified,
+            and the response's ETag / Last-Modified validators; None if the extension is unavailable
+        """
+        retries = self._retries
+        while True:
             try:
-                logger.debug(f"Download attempt {attempt + 1}/{max_retries} for {download_url}")
-                
-                # Rate limiting
-                if attempt > 0:
-                    time.sleep(retry_delay * attempt)
-                
-                response = self.session.get(
-                    download_url, 
-                    stream=True, 
-                    timeout=timeout
-                )
-                
-                if response.status_code == 204:
-                    logger.warning("HTTP 204: No Content - Extension may not be available for download")
-                    return None
-                elif response.status_code != 200:
-                    raise ValueError(f"HTTP Error {response.status_code}: {response.reason}")
-                
-                # Check content type
-                content_type = response.headers.get('content-type', '').lower()
-                if 'text/html' in content_type:
-                    logger.warning("Received HTML instead of CRX file - extension may not be available")
-                    logger.debug(f"Response content preview: {response.text[:200]}")
-                    return None
-                
-                # Get file size if available
-                content_length = response.headers.get('content-length')
-                file_size = int(content_length) if content_length else None
-                
-                if file_size:
-                    logger.info(f"File size: {self._format_size(file_size)}")
-                
-                # Download the file with progress indication
-                downloaded_bytes = 0
-                crx_data = b''
-                
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        crx_data += chunk
-                        downloaded_bytes += len(chunk)
-                        
-                        if show_progress and file_size:
-                            progress = (downloaded_bytes / file_size) * 100
-                            print(f"\rDownloading... {progress:.1f}% ({self._format_size(downloaded_bytes)}/{self._format_size(file_size)})", 
-                                  end='', flush=True)
-                
-                if show_progress:
-                    print()  # New line after progress
-                
-                logger.info(f"Download completed: {self._format_size(downloaded_bytes)}")
-                return crx_data
-                
-            except requests.exceptions.Timeout:
-                logger.warning(f"Timeout on attempt {attempt + 1}/{max_retries}")
-                if attempt == max_retries - 1:
-                    raise ValueError(f"Download timeout after {max_retries} attempts")
-            except requests.exceptions.ConnectionError as e:
-                logger.warning(f"Connection error on attempt {attempt + 1}/{max_retries}: {e}")
-                if attempt == max_retries - 1:
-                    raise ValueError(f"Connection failed after {max_retries} attempts: {e}")
-            except Exception as e:
-                logger.error(f"Download error on attempt {attempt + 1}/{max_retries}: {e}")
-                if attempt == max_retries - 1:
+                return self._stream_crx(download_url, crx_path, show_progress, headers)
+            except IncompleteDownloadError as e:
+                try:
+                    retries = retries.increment('GET', download_url, error=e)
+                except urllib3.exceptions.MaxRetryError:
                     raise e
+                logger.warning(f"{e} - retrying")
+                retries.sleep()
+    
+    def _stream_crx(self, download_url: str, crx_path: Path, show_progress: bool,
+                    headers: Optional[Dict[str, str]]) -> Optional[Dict[str, Any]]:
+        """One attempt of _download_crx: request the CRX and stream the response body to crx_path"""
+        # Bind everything the chunk loop touches to locals up front
+        chunk_size = self.cfg.chunk_size
+        # A redrawn progress line is only useful on a terminal; piped or logged output
+        # would just collect carriage-return noise
+        show_progress = show_progress and sys.stdout.isatty()
+        debug = logger.isEnabledFor(logging.DEBUG)
+        monotonic = time.monotonic
+        write_progress = self._write_progress
+        cancelled = self._cancelled.is_set
         
-        return None
+        if cancelled():
+            raise ValueError("Download cancelled")
+        
+        # Retries and backoff for connection errors and retryable statuses happen in the adapter
+        try:
+            response = self.session.get(
+                download_url, 
+                stream=True, 
+                timeout=self.cfg.timeout,
+                headers=headers
+            )
+        except requests.exceptions.Timeout:
+            raise ValueError(f"Download timeout after {self.cfg.max_retries} attempts")
+        except requests.exceptions.ConnectionError as e:
+            raise ValueError(f"Connection failed after {self.cfg.max_retries} attempts: {e}")
+        
+        with response:
+            if response.status_code == 304:
+                return {"size": 0, "not_modified": True, "etag": None, "last_modified": None}
+            elif response.status_code == 204:
+                logger.warning("HTTP 204: No Content - Extension may not be available for download")
+                return None
+            elif response.status_code in (403, 429):
+                raise DownloadBlockedError(f"HTTP Error {response.status_code}: {response.reason}")
+            elif response.status_code != 200:
+                raise ValueError(f"HTTP Error {response.status_code}: {response.reason}")
+            
+            # Check content type
+            content_type = response.headers.get('content-type', '').lower()
+            if 'text/html' in content_type:
+                logger.warning("Received HTML instead of CRX file - extension may not be available")
+                if debug:
+                    logger.debug(f"Response content preview: {response.text[:200]}")
+                return None
+            
+            # Get file size if available
+            content_length = response.headers.get('content-length')
+            file_size = int(content_length) if content_length else None
+            
+            if file_size:
+                logger.info(f"File size: {self._format_size(file_size)}")
+            
+            # Refuse oversized files before writing them, and stop mid-stream if the
+            # server sent no (or a wrong) Content-Length
+            max_size = self.cfg.max_file_size
+            if file_size and file_size > max_size:
+                raise ValueError(f"File too large: {self._format_size(file_size)} > {self._format_size(max_size)}")
+            
+            # Stream the file to disk with progress indication
+            downloaded_bytes = 0
+            report_progress = show_progress and file_size
+            if report_progress:
+                total_size = self._format_size(file_size)
+                next_report = 0.0
+            
+            # Uncompressed bodies are read straight from urllib3, skipping the decoder
+            # and requests' iter_content wrapper
+            if response.headers.get('content-encoding', 'identity').lower() == 'identity':
+                chunks = response.raw.stream(chunk_size, decode_content=False)
+            else:
+                chunks = response.iter_content(chunk_size=chunk_size)
+            
+            # A kept CRX may be a hard link to its cached blob; unlink it rather than
+            # truncating the blob through it
+            if os.path.lexists(crx_path):
+                os.unlink(crx_path)
+            
+            # Reading urllib3 directly bypasses requests' exception wrapping, so body errors
+            # from either source are mapped to ValueError here, like the connect errors above
+            try:
+                with open(crx_path, 'wb', buffering=1 << 20) as f:
+                    write = f.write
+                    for chunk in chunks:
+                        if chunk:
+                            write(chunk)
+                            downloaded_bytes += len(chunk)
+                            if downloaded_bytes > max_size:
+                                raise ValueError(f"File too large: more than {self._format_size(max_size)}")
+                            if cancelled():
+                                raise ValueError("Download cancelled")
+                            
+                            # Redraw the progress line at most PROGRESS_INTERVAL_SECONDS apart
+                            if report_progress:
+                                now = monotonic()
+                                if now >= next_report:
+                                    write_progress(downloaded_bytes, file_size, total_size)
+                                    next_report = now + PROGRESS_INTERVAL_SECONDS
+            except (urllib3.exceptions.HTTPError, requests.exceptions.RequestException) as e:
+                raise IncompleteDownloadError(f"Download interrupted after {downloaded_bytes} bytes: {e}")
+            
+            # urllib3 1.26 doesn't enforce Content-Length, so a body cut short would otherwise
+            # pass for a complete download (and be cached). tell() counts bytes on the wire,
+            # which is what Content-Length describes even for compressed responses
+            received_bytes = response.raw.tell()
+            if file_size is not None and received_bytes != file_size:
+                raise IncompleteDownloadError(
+                    f"Incomplete download: received {received_bytes} of {file_size} bytes")
+            
+            if report_progress:
+                write_progress(downloaded_bytes, file_size, total_size)
+            if show_progress:
+                print()  # New line after progress
+            
+            logger.info(f"Download completed: {self._format_size(downloaded_bytes)}")
+            return {
+                "size": downloaded_bytes,
+                "not_modified": False,
+                "etag": response.headers.get('etag'),
+                "last_modified": response.headers.get('last-modified'),
+            }
+    
+    def _write_progress(self, downloaded_bytes: int, file_size: int, total_size: str):
+        """Redraw the single-line download progress indicator"""
+        progress = (downloaded_bytes / file_size) * 100
+        sys.stdout.write(f"\rDownloading... {progress:.1f}% ({self._format_size(downloaded_bytes)}/{total_size})")
+        sys.stdout.flush()
     
-    def download_multiple(self, extension_ids: List[str], output_dir: Optional[str] = None, 
+    def download_multiple(self, extension_ids: Iterable[str], output_dir: Optional[str] = None, 
                          max_workers: Optional[int] = None) -> Dict[str, str]:
         """
         Download multiple extensions concurrently
         
+        IDs are consumed lazily, so a generator can feed the pool while it is still
+        being read. At most max_workers * BATCH_IN_FLIGHT_PER_WORKER downloads are queued
+        at any time; invalid IDs are reported as failed downloads rather than aborting
+        the batch. If the server starts refusing downloads (HTTP 403/429), queued
+        downloads that haven't started are cancelled, no further IDs are submitted,
+        and every ID left over is reported as a failed download that was not attempted.
+        
+        Fetching and conversion run in separate thread pools, so a worker that has
+        finished downloading a CRX moves on to the next download while the previous
+        one is converted and extracted.
+        
         Args:
-            extension_ids (List[str]): List of Chrome extension IDs
+            extension_ids (Iterable[str]): Chrome extension IDs
             output_dir (str): Output directory (optional)
-            max_workers (int): Maximum concurrent downloads (optional)
+            max_workers (int): Maximum concurrent downloads, capped at MAX_BATCH_WORKERS (optional)
         
         Returns:
-            Dict[str, str]: Mapping of extension_id to output_file_path
+            Dict[str, str]: Mapping of extension_id to output_file_path, in input order
         """
-        if not extension_ids:
-            return {}
-        
-        # Validate all extension IDs first
-        invalid_ids = [eid for eid in extension_ids if not self.validate_extension_id(eid)]
-        if invalid_ids:
-            raise ValueError(f"Invalid extension IDs: {invalid_ids}")
+        validate = self.validate_extension_id
         
         # Setup output directory
         if output_dir:
@@ -433,33 +899,123 @@ class AutoExtensionDownloader:
             self.config.config["output"]["default_directory"] = str(output_path)
         
         max_workers = max_workers or self.config.config["performance"]["max_concurrent_downloads"]
-        results = {}
-        failed_downloads = []
+        if max_workers > MAX_BATCH_WORKERS:
+            logger.info(f"Limiting batch download to {MAX_BATCH_WORKERS} workers (requested {max_workers})")
+            max_workers = MAX_BATCH_WORKERS
+        if max_workers > self._pool_size:
+            # Grow the shared pool so threads don't discard connections to the same host
+            self._mount_adapter(max_workers)
+        convert_workers = min(max_workers, os.cpu_count() or 1)
+        # Conversions already run convert_workers at a time, so split the CPUs between
+        # them rather than letting each extraction start a CPU-sized pool of its own
+        extract_workers = max((os.cpu_count() or 1) // convert_workers, 1)
+        # One (extension_id, result, error) slot per input ID, filled in as downloads
+        # finish, so results and failures are reported in input order
+        outcomes = []
+        # In-flight futures of each stage, mapped to their slot index
+        fetching = {}
+        converting = {}
+        max_in_flight = max_workers * BATCH_IN_FLIGHT_PER_WORKER
+        blocked = None
+        not_attempted = "Not attempted: server refused downloads"
         
-        logger.info(f"Starting batch download of {len(extension_ids)} extensions with {max_workers} workers")
+        def collect(futures):
+            nonlocal blocked
+            for future in futures:
+                if future in fetching:
+                    index = fetching.pop(future)
+                    try:
+                        # Hand the downloaded CRX to the conversion pool
+                        converting[convert_executor.submit(self._convert_crx, future.result(),
+                                                           extract_workers=extract_workers)] = index
+                        continue
+                    except DownloadBlockedError as e:
+                        if not blocked:
+                            blocked = e
+                            # Queued downloads would only be refused too; running ones finish
+                            for queued, queued_index in list(fetching.items()):
+                                if queued.cancel():
+                                    del fetching[queued]
+                                    outcomes[queued_index] = (outcomes[queued_index][0], None, not_attempted)
+                        error = e
+                    except Exception as e:
+                        error = e
+                else:
+                    index = converting.pop(future)
+                    try:
+                        result = future.result()
+                        outcomes[index] = (outcomes[index][0], result, None)
+                        logger.info(f"Downloaded: {outcomes[index][0]} -> {result}")
+                        continue
+                    except Exception as e:
+                        error = e
+                outcomes[index] = (outcomes[index][0], None, str(error))
+                logger.error(f"Failed to download {outcomes[index][0]}: {error}")
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all download tasks
-            future_to_id = {
-                executor.submit(self.download_and_convert, ext_id, show_progress=False): ext_id 
-                for ext_id in extension_ids
-            }
-            
-            # Process completed downloads
-            for future in as_completed(future_to_id):
-                ext_id = future_to_id[future]
+        def wait_for_any():
+            done, _ = wait(fetching.keys() | converting.keys(), return_when=FIRST_COMPLETED)
+            collect(done)
+        
+        logger.info(f"Starting batch download with {max_workers} workers")
+        _warm_dns(CWS_UPDATE_HOST)
+        self._cancelled.clear()
+        
+        # One work directory for the whole batch, inside the output directory so finished
+        # files can be renamed into place
+        batch_output_dir = Path(self.config.config["output"]["default_directory"])
+        batch_output_dir.mkdir(parents=True, exist_ok=True)
+        
+        try:
+            with tempfile.TemporaryDirectory(prefix='.batch-', dir=batch_output_dir) as work_dir, \
+                    ThreadPoolExecutor(max_workers=max_workers) as fetch_executor, \
+                    ThreadPoolExecutor(max_workers=convert_workers) as convert_executor:
+                work_dir = Path(work_dir)
                 try:
-                    result = future.result()
-                    results[ext_id] = result
-                    logger.info(f"Downloaded: {ext_id} -> {result}")
-                except Exception as e:
-                    failed_downloads.append((ext_id, str(e)))
-                    logger.error(f"Failed to download {ext_id}: {e}")
+                    # Submit downloads as IDs arrive, waiting for a slot once the window is full
+                    extension_ids = iter(extension_ids)
+                    for ext_id in extension_ids:
+                        if not validate(ext_id):
+                            outcomes.append((ext_id, None, "Invalid extension ID"))
+                            logger.error(f"Invalid extension ID: {ext_id}")
+                            continue
+                        fetching[fetch_executor.submit(self._fetch_crx, ext_id, show_progress=False,
+                                                       work_dir=work_dir)] = len(outcomes)
+                        outcomes.append((ext_id, None, None))
+                        if len(fetching) + len(converting) >= max_in_flight:
+                            wait_for_any()
+                        if blocked:
+                            logger.warning(f"Server refused downloads ({blocked}); not submitting the remaining extensions")
+                            outcomes.extend((ext_id, None, not_attempted) for ext_id in extension_ids)
+                            break
+                    
+                    # Process the remaining downloads and conversions
+                    while fetching or converting:
+                        wait_for_any()
+                except KeyboardInterrupt:
+                    # Drop queued work and make running downloads stop at their next chunk;
+                    # leaving the with block then waits for them and removes the work directory
+                    logger.warning("Batch download interrupted - cancelling pending downloads")
+                    self.cancel()
+                    for future in fetching.keys() | converting.keys():
+                        future.cancel()
+                    raise
+        
+        finally:
+            # Leave the downloader usable for later downloads after an interrupted batch
+            self._cancelled.clear()
         
         # Restore original output directory
         if output_dir:
             self.config.config["output"]["default_directory"] = original_dir
         
+        results = {}
+        failed_downloads = []
+        for ext_id, result, error in outcomes:
+            if result:
+                results[ext_id] = result
+            else:
+                failed_downloads.append((ext_id, error))
+        
         # Report results
         logger.info(f"Batch download completed: {len(results)} successful, {len(failed_downloads)} failed")
         if failed_downloads:
@@ -481,31 +1037,40 @@ class AutoExtensionDownloader:
             Dict[str, str]: Mapping of extension_id to output_file_path
         """
         try:
-            with open(file_path, 'r') as f:
-                extension_ids = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-            
-            if not extension_ids:
+            extension_ids = self._iter_extension_ids(file_path)
+            # Pull the first ID now so a missing or empty file is reported before the pool starts
+            first_id = next(extension_ids, None)
+            if first_id is None:
                 logger.warning(f"No valid extension IDs found in {file_path}")
                 return {}
             
-            logger.info(f"Found {len(extension_ids)} extension IDs in {file_path}")
-            return self.download_multiple(extension_ids, output_dir)
+            logger.info(f"Reading extension IDs from {file_path}")
+            return self.download_multiple(chain((first_id,), extension_ids), output_dir)
             
         except FileNotFoundError:
             raise FileNotFoundError(f"Extension list file not found: {file_path}")
         except Exception as e:
             raise ValueError(f"Error reading extension list file: {e}")
     
+    @staticmethod
+    def _iter_extension_ids(file_path: str) -> Iterator[str]:
+        """Yield extension IDs from a list file, skipping blanks and # comments"""
+        # One read and a C-level splitlines; only the lines that are kept get decoded
+        data = Path(file_path).read_bytes()
+        if data.startswith(b'\xef\xbb\xbf'):
+            data = data[3:]  # UTF-8 BOM written by some Windows editors
+        for line in data.splitlines():
+            line = line.strip()
+            if line and not line.startswith(b'#'):
+                yield line.decode('utf-8', 'replace')
+    
     def _format_size(self, size_bytes: int) -> str:
         """Format file size in human readable format"""
-        if size_bytes < 1024:
+        # bit_length picks the unit directly: every 10 bits is another factor of 1024
+        unit = min(max(int(size_bytes).bit_length() - 1, 0) // 10, 3)
+        if unit == 0:
             return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+        return f"{size_bytes / (1 << (10 * unit)):.1f} {SIZE_UNITS[unit]}"
 
 
 def create_sample_config():
@@ -520,6 +1085,9 @@ def interactive_mode():
     print("🔧 Chrome Extension Downloader - Interactive Mode")
     print("=" * 50)
     
+    # One downloader for the whole session so its connection pool is reused between choices
+    downloader = None
+    
     while True:
         print("\nOptions:")
         print("1. Download single extension")
@@ -534,7 +1102,7 @@ def interactive_mode():
             extension_id = input("Enter extension ID: ").strip()
             if extension_id:
                 try:
-                    downloader = AutoExtensionDownloader()
+                    downloader = downloader or AutoExtensionDownloader()
                     result = downloader.download_and_convert(extension_id)
                     print(f"✅ Success! Downloaded to: {result}")
                 except Exception as e:
@@ -551,7 +1119,7 @@ def interactive_mode():
             
             if extension_ids:
                 try:
-                    downloader = AutoExtensionDownloader()
+                    downloader = downloader or AutoExtensionDownloader()
                     results = downloader.download_multiple(extension_ids)
                     print(f"✅ Downloaded {len(results)} extensions successfully!")
                 except Exception as e:
@@ -561,7 +1129,7 @@ def interactive_mode():
             file_path = input("Enter path to file with extension IDs: ").strip()
             if file_path:
                 try:
-                    downloader = AutoExtensionDownloader()
+                    downloader = downloader or AutoExtensionDownloader()
                     results = downloader.download_from_file(file_path)
                     print(f"✅ Downloaded {len(results)} extensions successfully!")
                 except Exception as e:
@@ -571,6 +1139,8 @@ def interactive_mode():
             create_sample_config()
         
         elif choice == '5':
+            if downloader:
+                downloader.close()
             print("Goodbye!")
             break
         
@@ -617,7 +1187,7 @@ Examples:
     parser.add_argument('--keep-crx', action='store_true', help='Keep the CRX file after conversion (default: delete)')
     
     # Performance options
-    parser.add_argument('--max-workers', type=int, help='Maximum concurrent downloads (default: 3)')
+    parser.add_argument('--max-workers', type=int, help='Maximum concurrent downloads (default: 3, at most 16)')
     parser.add_argument('--no-progress', action='store_true', help='Disable progress indicators')
     
     # Configuration options
@@ -653,6 +1223,7 @@ Examples:
         parser.print_help()
         return 1
     
+    downloader = None
     try:
         # Create configuration
         config = Config(args.config) if args.config else Config()
@@ -667,7 +1238,7 @@ Examples:
         if args.keep_crx:
             config.config["output"]["auto_cleanup"] = False
         
-        # Create downloader
+        # Create downloader (closed in the finally block below)
         downloader = AutoExtensionDownloader(config)
         
         if args.verbose:
@@ -696,6 +1267,13 @@ Examples:
             print(f"🎉 Success! Extension downloaded to: {result}")
             
         elif args.batch:
+            # Reject malformed IDs before any request is made, as for a single ID
+            invalid_ids = [ext_id for ext_id in args.batch if not downloader.validate_extension_id(ext_id)]
+            if invalid_ids:
+                print(f"❌ Error: Invalid extension ID format: {', '.join(invalid_ids)}")
+                print("Extension IDs must be exactly 32 characters (a-p only)")
+                return 1
+            
             # Multiple extensions download
             results = downloader.download_multiple(
                 args.batch, 
@@ -718,6 +1296,9 @@ Examples:
         logger.error(f"Fatal error: {e}")
         print(f"❌ Error: {e}", file=sys.stderr)
         return 1
+    finally:
+        if downloader:
+            downloader.close()
 
 
 if __name__ == '__main__':
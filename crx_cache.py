@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Persistent CRX download cache with HTTP revalidation
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class CrxCache:
+    """
+    On-disk cache of downloaded CRX files keyed by extension ID
+
+    Each entry remembers the download URL, when it was stored, the CRX's size
+    and the ETag / Last-Modified validators the server sent, so later runs can
+    skip the download while the entry is fresh and revalidate it with a
+    conditional request (one 304 round trip) once it has expired.
+
+    The index is kept in least-recently-used order and the cache is bounded by
+    entry count and total size; the oldest CRX files are deleted on overflow.
+    """
+
+    INDEX_FILENAME = "index.json"
+
+    def __init__(self, cache_dir: str, expire_after: float = 86400,
+                 max_entries: int = 100, max_size_bytes: int = 500 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.expire_after = expire_after
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_bytes
+        self.index_file = self.cache_dir / self.INDEX_FILENAME
+        self._lock = threading.Lock()
+        self.entries = self._load_index()
+
+    def _load_index(self) -> "OrderedDict[str, Dict[str, Any]]":
+        """Load the cache index (oldest entry first), starting empty if it is missing or unreadable"""
+        if not self.index_file.exists():
+            return OrderedDict()
+        try:
+            with open(self.index_file, 'r') as f:
+                return OrderedDict(json.load(f))
+        except Exception as e:
+            logger.warning(f"Failed to load cache index: {e}. Starting with an empty cache.")
+            return OrderedDict()
+
+    def _save_index(self):
+        """Atomically rewrite the cache index (caller holds the lock)"""
+        tmp_file = self.index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_file, self.index_file)
+
+    def blob_path(self, extension_id: str) -> Path:
+        """Path of the cached CRX file for an extension"""
+        return self.cache_dir / f"{extension_id}.crx"
+
+    def lookup(self, extension_id: str, download_url: str) -> Optional[Dict[str, Any]]:
+        """Return the cache entry for an extension if its CRX is on disk intact and was fetched from download_url"""
+        entry = self.entries.get(extension_id)
+        if not entry or entry.get("url") != download_url:
+            return None
+        # A single stat both proves the blob exists and catches truncated or replaced files
+        try:
+            blob_size = self.blob_path(extension_id).stat().st_size
+        except FileNotFoundError:
+            blob_size = None
+        if blob_size != entry.get("size"):
+            logger.warning(f"Cached CRX for {extension_id} is missing or damaged; discarding it")
+            self.discard(extension_id)
+            return None
+        return entry
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Whether an entry can be used without contacting the server"""
+        return time.time() - entry.get("stored_at", 0) < self.expire_after
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for revalidating an entry"""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    @staticmethod
+    def _link_or_copy(src: Path, dst: Path):
+        """
+        Atomically put src's contents at dst, hard-linking where possible
+
+        A link avoids a full copy of the CRX; a copy is the fallback across
+        filesystems or where links aren't supported. Either way dst is
+        swapped in with os.replace, so a file already at dst (possibly
+        another link to the same blob) is replaced rather than overwritten.
+        """
+        tmp_path = dst.with_name(f".{dst.name}.{threading.get_ident()}.tmp")
+        try:
+            os.link(src, tmp_path)
+        except FileNotFoundError:
+            raise
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+
+    def restore(self, extension_id: str, crx_path: Path) -> int:
+        """
+        Put the cached CRX at crx_path, mark it most recently used and return its size in bytes
+
+        Raises FileNotFoundError if the blob was evicted since lookup().
+        """
+        self._link_or_copy(self.blob_path(extension_id), crx_path)
+        with self._lock:
+            if extension_id in self.entries:
+                self.entries.move_to_end(extension_id)
+                self._save_index()
+        return crx_path.stat().st_size
+
+    def store(self, extension_id: str, download_url: str, crx_path: Path,
+              etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Add a freshly downloaded CRX to the cache and record its size and validators"""
+        blob_path = self.blob_path(extension_id)
+        self._link_or_copy(crx_path, blob_path)
+
+        with self._lock:
+            self.entries[extension_id] = {
+                "url": download_url,
+                "stored_at": time.time(),
+                "size": blob_path.stat().st_size,
+                "etag": etag,
+                "last_modified": last_modified,
+            }
+            self.entries.move_to_end(extension_id)
+            self._evict(keep=extension_id)
+            self._save_index()
+
+    def _evict(self, keep: str):
+        """Drop least-recently-used entries until the cache fits its bounds (caller holds the lock)"""
+        total_size = sum(entry.get("size", 0) for entry in self.entries.values())
+        while len(self.entries) > 1 and (len(self.entries) > self.max_entries or total_size > self.max_size_bytes):
+            extension_id = next(iter(self.entries))
+            if extension_id == keep:
+                break
+            entry = self.entries.pop(extension_id)
+            total_size -= entry.get("size", 0)
+            try:
+                self.blob_path(extension_id).unlink()
+            except FileNotFoundError:
+                pass
+            logger.debug(f"Evicted {extension_id} from download cache")
+
+    def discard(self, extension_id: str):
+        """Forget an entry and delete its CRX file, e.g. once it turned out to be unusable"""
+        with self._lock:
+            if self.entries.pop(extension_id, None) is not None:
+                self._save_index()
+        try:
+            self.blob_path(extension_id).unlink()
+        except FileNotFoundError:
+            pass
+
+    def touch(self, extension_id: str):
+        """Mark an entry as freshly validated after a 304 response"""
+        with self._lock:
+            entry = self.entries.get(extension_id)
+            if entry:
+                entry["stored_at"] = time.time()
+                self.entries.move_to_end(extension_id)
+                self._save_index()
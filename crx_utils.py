@@ -7,12 +7,70 @@ Chrome Web Store URL Constructor
 
 import argparse
 import urllib.parse
-import re
 import platform
 import sys
 import struct
 import zipfile
 import os
+import shutil
+import mmap
+
+# Host serving CRX downloads (the start of every URL built by to_cws_url)
+CWS_UPDATE_HOST = 'clients2.google.com'
+
+# Units used by _format_size, indexed by power of 1024
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB')
+
+# Maps a-p to 0x00 and every other byte to 0xFF, so one C-level translate validates an ID
+_EXTENSION_ID_TABLE = bytes(0x00 if 97 <= b <= 112 else 0xFF for b in range(256))
+
+
+def is_valid_extension_id(extension_id):
+    """Check that extension_id is a Chrome extension ID: exactly 32 characters a-p"""
+    if not isinstance(extension_id, str) or len(extension_id) != 32 or not extension_id.isascii():
+        return False
+    return 0xFF not in extension_id.encode('ascii').translate(_EXTENSION_ID_TABLE)
+
+
+def copy_from_offset(src_file, dst_file, offset):
+    """
+    Copy everything from offset to the end of src_file into dst_file
+    
+    Uses os.copy_file_range where available so the bytes are copied inside the
+    kernel, then os.sendfile (older Linux kernels, cross-filesystem copies), and
+    finally shutil.copyfileobj with a 1 MiB buffer for other platforms or when
+    the kernel rejects both calls.
+    
+    Args:
+        src_file: Source file object opened for binary reading
+        dst_file: Destination file object opened unbuffered for binary writing
+        offset (int): Byte offset in src_file where the copy starts
+    """
+    remaining = os.fstat(src_file.fileno()).st_size - offset
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src_file.fileno(), dst_file.fileno(), remaining, offset)
+                if copied == 0:
+                    break
+                offset += copied
+                remaining -= copied
+        except OSError:
+            pass
+    if remaining > 0 and hasattr(os, 'sendfile'):
+        try:
+            while remaining > 0:
+                sent = os.sendfile(dst_file.fileno(), src_file.fileno(), offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+        except OSError:
+            pass
+    if remaining > 0:
+        src_file.seek(offset)
+        shutil.copyfileobj(src_file, dst_file, length=1 << 20)
+
 
 class ChromeWebStoreURLBuilder:
     def __init__(self):
@@ -27,6 +85,12 @@ class ChromeWebStoreURLBuilder:
             'prodversion': self._get_chrome_version(),
             'xid': None  # Extension ID - must be provided
         }
+        
+        # Build the default-options URL once, with a %s slot for the extension ID
+        # ('%' in the URL itself is doubled so it survives the formatting)
+        self._default_url_template = self._build_cws_url(
+            dict(self.default_options, xid='\0')
+        ).replace('%', '%%').replace('\0', '%s')
     
     def _detect_platform_info(self):
         """
@@ -93,19 +157,25 @@ class ChromeWebStoreURLBuilder:
             str: Complete Chrome Web Store download URL
         """
         # Validate extension ID format (32 characters, a-p)
-        if not re.match(r'^[a-p]{32}$', extension_id):
+        if not is_valid_extension_id(extension_id):
             raise ValueError(f"Invalid extension ID format: {extension_id}")
         
+        if not kwargs:
+            return self._default_url_template % extension_id
+        
         # Update default options with any provided kwargs
         options = self.default_options.copy()
         options.update(kwargs)
         options['xid'] = extension_id
-        
+        return self._build_cws_url(options)
+    
+    def _build_cws_url(self, options):
+        """Assemble the download URL from a complete set of options, including xid"""
         # Determine product ID based on Chrome vs Chromium detection
         product_id = 'chromecrx' if self._is_chrome_not_chromium() else 'chromiumcrx'
         
         # Build the URL following the exact pattern from cws_pattern.js
-        url = 'https://clients2.google.com/service/update2/crx?response=redirect'
+        url = 'https://' + CWS_UPDATE_HOST + '/service/update2/crx?response=redirect'
         url += '&os=' + options['os']
         url += '&arch=' + options['arch']
         url += '&os_arch=' + options['arch']  # crbug.com/709147 - should be archName of chrome.system.cpu.getInfo
@@ -134,51 +204,11 @@ class ChromeWebStoreURLBuilder:
             output_filename = "extension.zip"
         
         try:
-            # Check if it's already a ZIP file (starts with PK signature)
-            if len(crx_data) >= 4 and crx_data[:4] == b'PK\x03\x04':
-                print("Input is already a ZIP file")
-                with open(output_filename, 'wb') as f:
-                    f.write(crx_data)
-                return output_filename
-            
-            # Check CRX magic number "Cr24" (67, 114, 50, 52)
-            if len(crx_data) < 8 or crx_data[:4] != b'Cr24':
-                # Try to find ZIP signature within the data
-                zip_data = self._find_zip_in_data(crx_data)
-                if zip_data:
-                    with open(output_filename, 'wb') as f:
-                        f.write(zip_data)
-                    return output_filename
-                else:
-                    raise ValueError("Invalid CRX file: Does not start with Cr24")
-            
-            # Parse CRX version (byte 4)
-            version = crx_data[4]
-            if version not in [2, 3]:
-                raise ValueError(f"Unexpected CRX format version: {version}")
-            
-            print(f"CRX Version: {version}")
-            
-            zip_start_offset = 0
-            if version == 2:
-                # CRX2 format
-                zip_start_offset = self._parse_crx2_header(crx_data)
-            else:
-                # CRX3 format  
-                zip_start_offset = self._parse_crx3_header(crx_data)
-            
-            if zip_start_offset >= len(crx_data):
-                raise ValueError("CRX file appears to be corrupted")
+            zip_start_offset = self.get_zip_offset(crx_data)
             
             # Extract ZIP data
             zip_data = crx_data[zip_start_offset:]
             
-            # Check for nested CRX (Opera addons sometimes do this)
-            if (version == 3 and len(zip_data) >= 4 and 
-                zip_data[:4] == b'Cr24'):
-                print("Found nested CRX, extracting inner ZIP...")
-                return self.crx_to_zip(zip_data, output_filename)
-            
             # Write ZIP file
             with open(output_filename, 'wb') as f:
                 f.write(zip_data)
@@ -204,6 +234,103 @@ class ChromeWebStoreURLBuilder:
         except Exception as e:
             raise ValueError(f"Error converting CRX to ZIP: {e}")
     
+    def crx_to_zip_path(self, crx_path, zip_path):
+        """
+        Convert a CRX file on disk to a ZIP file without reading it into memory
+        
+        Well-formed CRX2/CRX3 files are handled from their fixed-size header alone;
+        anything else (nested CRX, odd header lengths, bare ZIPs) goes through
+        get_zip_offset on a read-only mapping of the file. The ZIP payload is then
+        copied file-to-file with copy_from_offset.
+        
+        Args:
+            crx_path (str): Path to the CRX file
+            zip_path (str): Path of the ZIP file to create
+        
+        Returns:
+            str: Path to the created ZIP file
+        """
+        with open(crx_path, 'rb') as src:
+            zip_offset = self._read_zip_offset(src)
+            if zip_offset is None:
+                with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as crx_view:
+                    zip_offset = self.get_zip_offset(crx_view)
+            with open(zip_path, 'wb', buffering=0) as dst:
+                copy_from_offset(src, dst, zip_offset)
+        return str(zip_path)
+    
+    def _read_zip_offset(self, crx_file):
+        """
+        Find the ZIP offset of a plain CRX2/CRX3 file from its header alone
+        
+        Returns:
+            int: Offset of the ZIP archive, or None if the header isn't a plain
+            CRX2/CRX3 header directly followed by a local file header
+        """
+        header = crx_file.read(16)
+        if len(header) < 16:
+            return None
+        magic, version, first_length, second_length = struct.unpack('<4sIII', header)
+        if magic != b'Cr24':
+            return None
+        if version == 3 and first_length <= 10000:
+            zip_offset = 12 + first_length
+        elif version == 2 and first_length <= 10000 and second_length <= 10000:
+            zip_offset = 16 + first_length + second_length
+        else:
+            return None
+        crx_file.seek(zip_offset)
+        if crx_file.read(4) != b'PK\x03\x04':
+            return None
+        return zip_offset
+    
+    def get_zip_offset(self, crx_data):
+        """
+        Locate the embedded ZIP archive inside CRX file data
+        
+        Args:
+            crx_data (bytes): Raw CRX file data (any bytes-like object, e.g. an mmap)
+        
+        Returns:
+            int: Offset of the first byte of the ZIP archive
+        """
+        # Check if it's already a ZIP file (starts with PK signature)
+        if len(crx_data) >= 4 and crx_data[:4] == b'PK\x03\x04':
+            print("Input is already a ZIP file")
+            return 0
+        
+        # Check CRX magic number "Cr24" (67, 114, 50, 52)
+        if len(crx_data) < 8 or crx_data[:4] != b'Cr24':
+            # Try to find ZIP signature within the data
+            zip_start_offset = self._find_zip_start(crx_data)
+            if zip_start_offset is None:
+                raise ValueError("Invalid CRX file: Does not start with Cr24")
+            return zip_start_offset
+        
+        # Parse CRX version (byte 4)
+        version = crx_data[4]
+        if version not in [2, 3]:
+            raise ValueError(f"Unexpected CRX format version: {version}")
+        
+        print(f"CRX Version: {version}")
+        
+        if version == 2:
+            # CRX2 format
+            zip_start_offset = self._parse_crx2_header(crx_data)
+        else:
+            # CRX3 format  
+            zip_start_offset = self._parse_crx3_header(crx_data)
+        
+        if zip_start_offset >= len(crx_data):
+            raise ValueError("CRX file appears to be corrupted")
+        
+        # Check for nested CRX (Opera addons sometimes do this)
+        if version == 3 and crx_data[zip_start_offset:zip_start_offset + 4] == b'Cr24':
+            print("Found nested CRX, extracting inner ZIP...")
+            return zip_start_offset + self.get_zip_offset(crx_data[zip_start_offset:])
+        
+        return zip_start_offset
+    
     def _parse_crx2_header(self, crx_data):
         """Parse CRX2 header and return ZIP start offset"""
         if len(crx_data) < 16:
@@ -240,8 +367,8 @@ class ChromeWebStoreURLBuilder:
         
         return 12 + header_length
     
-    def _find_zip_in_data(self, data):
-        """Find ZIP signature within data"""
+    def _find_zip_start(self, data):
+        """Find the position of the first ZIP signature within data"""
         # ZIP files start with PK signature (0x504B)
         zip_signatures = [b'PK\x03\x04', b'PK\x05\x06', b'PK\x07\x08']
         
@@ -249,28 +376,25 @@ class ChromeWebStoreURLBuilder:
             pos = data.find(sig)
             if pos != -1:
                 print(f"Found ZIP signature at position {pos}")
-                return data[pos:]
+                return pos
         
         return None
     
     def _find_zip_offset(self, crx_data):
         """Find ZIP data offset by searching for ZIP signature"""
-        zip_data = self._find_zip_in_data(crx_data)
-        if zip_data:
-            return len(crx_data) - len(zip_data)
+        pos = self._find_zip_start(crx_data)
+        if pos is not None:
+            return pos
         else:
             raise ValueError("No ZIP signature found in CRX file")
     
     def _format_size(self, size_bytes):
         """Format file size in human readable format"""
-        if size_bytes < 1024:
+        # bit_length picks the unit directly: every 10 bits is another factor of 1024
+        unit = min(max(size_bytes.bit_length() - 1, 0) // 10, 3)
+        if unit == 0:
             return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+        return f"{size_bytes / (1 << (10 * unit)):.1f} {SIZE_UNITS[unit]}"
     
     def parse_chrome_store_url(self, chrome_store_url):
         """
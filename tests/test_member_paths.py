@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests that ZIP members are always extracted inside the extension directory
+
+Run from the repository root with: python -m unittest discover tests
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from chrome_extension_downloader import AutoExtensionDownloader, Config
+
+EXTENSION_ID = "a" * 32
+
+
+class MemberPathTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp()).resolve()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        # Members that escape would land in here, next to the extraction directory
+        self.extract_root = self.tmp_dir / "extract"
+        
+        config = Config(str(self.tmp_dir / "config.json"))
+        config.config["output"]["extract_directory"] = str(self.extract_root)
+        config.config["performance"]["enable_caching"] = False
+        self.downloader = AutoExtensionDownloader(config)
+        self.addCleanup(self.downloader.close)
+    
+    def extract(self, names):
+        """Build a ZIP with one small file per member name, extract it and return the extension directory"""
+        zip_path = self.tmp_dir / "test.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            for name in names:
+                zf.writestr(name, f"contents of {name}")
+        return Path(self.downloader._extract_zip(str(zip_path), EXTENSION_ID, {"name": "Test"})).resolve()
+    
+    def assert_all_inside(self, extension_dir):
+        """Every file written anywhere under the extraction root must be inside extension_dir"""
+        written = [path for path in self.extract_root.rglob("*") if path.is_file()]
+        self.assertTrue(written)
+        for path in written:
+            self.assertIn(extension_dir, path.resolve().parents, f"{path} escaped {extension_dir}")
+    
+    def test_parent_components_are_dropped(self):
+        extension_dir = self.extract(["../x.txt", "a/../../y.txt", "ok/file.txt"])
+        self.assert_all_inside(extension_dir)
+        self.assertTrue((extension_dir / "x.txt").is_file())
+        self.assertTrue((extension_dir / "a" / "y.txt").is_file())
+        self.assertTrue((extension_dir / "ok" / "file.txt").is_file())
+    
+    def test_absolute_paths_are_made_relative(self):
+        extension_dir = self.extract(["/abs/x.txt", "/abs/deeper/y.txt"])
+        self.assert_all_inside(extension_dir)
+        self.assertTrue((extension_dir / "abs" / "x.txt").is_file())
+        self.assertTrue((extension_dir / "abs" / "deeper" / "y.txt").is_file())
+    
+    @unittest.skipUnless(os.name == "nt", "drive letters are only special on Windows")
+    def test_windows_drive_components_are_sanitised(self):
+        extension_dir = self.extract(["a/C:/x.txt", "D:/y.txt", "a\\..\\..\\z.txt"])
+        self.assert_all_inside(extension_dir)
+        self.assertTrue((extension_dir / "a" / "C_" / "x.txt").is_file())
+    
+    @unittest.skipIf(os.name == "nt", "creating symlinks needs extra privileges on Windows")
+    def test_path_resolving_outside_is_rejected(self):
+        extension_dir = self.tmp_dir / "ext"
+        extension_dir.mkdir()
+        (extension_dir / "link").symlink_to(self.tmp_dir)
+        with self.assertRaises(zipfile.BadZipFile):
+            AutoExtensionDownloader._member_path(extension_dir, "link/x.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()